@@ -1,17 +1,63 @@
 """Simple game of blackjack."""
+from array import array
+from concurrent.futures import Future, ThreadPoolExecutor
+from itertools import combinations_with_replacement, product
+import random
+import sys
 from textwrap import dedent
 
-import requests
+try:
+    import orjson
+    import requests
+    from requests.adapters import HTTPAdapter
+    from urllib3.util.retry import Retry
+except ImportError:  # only needed for the online Deck
+    requests = None
+
+API_URL = "https://deckofcardsapi.com/api/deck"
+_RANK_INDEX = {"2": 0, "3": 1, "4": 2, "5": 3, "6": 4, "7": 5, "8": 6, "9": 7,
+               "10": 8, "JACK": 8, "QUEEN": 8, "KING": 8, "ACE": 9}
+_POINTS = array("b", [2, 3, 4, 5, 6, 7, 8, 9, 10, 11])
+SUITS = ("SPADES", "DIAMONDS", "CLUBS", "HEARTS")
+
+
+def _mask_score(mask: int) -> int:
+    """Calculate the score of a hand mask, counting aces as 1 where 11 would bust."""
+    score = 0
+    for rank_index in range(10):
+        count = (mask >> (4 * rank_index)) & 15
+        score += count * _POINTS[rank_index]
+    aces = (mask >> 36) & 15
+    while score > 21 and aces > 0:
+        score -= 10
+        aces -= 1
+    return score
+
+
+def _score_table(max_cards: int) -> dict:
+    """Precompute scores of all hands with up to max_cards cards, keyed by hand mask."""
+    table = {}
+    for size in range(max_cards + 1):
+        for hand in combinations_with_replacement(range(10), size):
+            mask = sum(1 << (4 * rank_index) for rank_index in hand)
+            table[mask] = _mask_score(mask)
+    return table
+
+
+SCORE_TABLE = _score_table(5)
 
 
 class Card:
     """Simple dataclass for holding card information."""
 
+    __slots__ = ("value", "suit", "code", "rank_index")
+
     def __init__(self, value: str, suit: str, code: str):
-        """Class constructor. Each card has value, suit and code."""
+        """Class constructor. Each card has value, suit, code and rank index (points - 2)."""
         self.value = value
         self.suit = suit
         self.code = code
+        self.rank_index = _RANK_INDEX[value]
 
     def __repr__(self) -> str:
         """Product object representation in object format."""
@@ -21,59 +67,132 @@ class Card:
 class Hand:
     """Simple class for holding hand information."""
 
+    __slots__ = ("cards", "_mask")
+
     def __init__(self):
-        """Class constructor. Each hand has cards and score."""
-        self.score = 0
+        """
+        Class constructor. Each hand has cards and score.
+
+        The cards are also counted in self._mask, 4 bits for each rank index.
+        """
         self.cards = []
-        self.aces = 0
+        self._mask = 0
+
+    @property
+    def score(self) -> int:
+        """Get the score of the hand."""
+        score = SCORE_TABLE.get(self._mask)
+        if score is None:
+            score = _mask_score(self._mask)
+        return score
 
     def add_card(self, card: Card):
-        """Add card to cards list and calculate score."""
-        card_values = {"2": 2, "3": 3, "4": 4, "5": 5, "6": 6, "7": 7, "8": 8, "9": 9,
-                       "10": 10, "JACK": 10, "QUEEN": 10, "KING": 10, "ACE": 11}
-        if card.value == "ACE":
-            self.aces += 1
-        self.score += card_values[card.value]
+        """Add card to cards list."""
+        self._mask += 1 << (4 * card.rank_index)
         self.cards.append(card)
-        while self.score > 21 and self.aces > 0:
-            self.score -= 10
-            self.aces -= 1
 
 
 class Deck:
     """Deck of cards. Provided via api over the network."""
 
+    prefetch = True  # draws wait on the network, worth drawing ahead in the background
+    _session = None
+
     def __init__(self, shuffle=False):
-        """Make new deck."""
+        """Make new deck. All decks share one pooled session, made with the first deck."""
+        if requests is None:
+            raise ImportError("The online deck needs requests and orjson installed!")
+        if Deck._session is None:
+            Deck._session = requests.Session()
+            Deck._session.mount("https://", HTTPAdapter(pool_connections=1, pool_maxsize=4,
+                                                        max_retries=Retry(total=2, backoff_factor=0.2)))
         if not shuffle:
-            self.deck = requests.get("https://deckofcardsapi.com/api/deck/new").json()
+            self.deck = self._get("new")
             self.is_shuffled = False
         else:
-            self.deck = requests.get("https://deckofcardsapi.com/api/deck/new/shuffle").json()
+            self.deck = self._get("new/shuffle")
             self.is_shuffled = True
         self.deck_id = self.deck["deck_id"]
+        self._buffer: list[Card] = []
+        self._batch = 10
 
     def shuffle(self):
         """Shuffle the deck."""
-        self.deck = requests.get(f"https://deckofcardsapi.com/api/deck/{self.deck_id}/shuffle").json()
+        self.deck = self._get(f"{self.deck_id}/shuffle")
+        self.is_shuffled = True
+        self._buffer = []
+
+    def draw(self) -> Card:
+        """
+        Draw card from the deck.
+
+        Cards are fetched from the api in batches of self._batch
+        and served from the local buffer until it runs out.
+        """
+        if not self._buffer:
+            self._fetch(self._batch)
+        return self._buffer.pop()
+
+    def draw_cards(self, count: int) -> list[Card]:
+        """Draw count cards from the deck with at most one api request."""
+        if len(self._buffer) < count:
+            self._fetch(max(self._batch, count - len(self._buffer)))
+        return [self._buffer.pop() for _ in range(count)]
+
+    def _get(self, path: str) -> dict:
+        """Make a request to the api and parse the json response."""
+        return orjson.loads(self._session.get(f"{API_URL}/{path}", timeout=5).content)
+
+    def _fetch(self, count: int):
+        """Fetch count cards from the api to the bottom of the buffer."""
+        result = self._get(f"{self.deck_id}/draw/?count={count}")
+        self._buffer[:0] = [Card(card["value"], card["suit"], card["code"]) for card in result["cards"]]
+
+
+class LocalDeck:
+    """Deck of cards. Shuffled locally, same interface as Deck."""
+
+    prefetch = False
+
+    def __init__(self, shuffle=False):
+        """Make new deck."""
+        self._new()
+        self.is_shuffled = False
+        if shuffle:
+            self.shuffle()
+
+    def shuffle(self):
+        """Shuffle the deck. Like the api, all drawn cards are returned to the deck."""
+        self._new()
+        random.shuffle(self._cards)
         self.is_shuffled = True
 
+    def _new(self):
+        """Fill the deck with all 52 cards."""
+        self._cards = [Card(value, suit, f"{'0' if value == '10' else value[0]}{suit[0]}")
+                       for value, suit in product(_RANK_INDEX, SUITS)]
+
     def draw(self) -> Card:
         """Draw card from the deck."""
-        result = requests.get(f"https://deckofcardsapi.com/api/deck/{self.deck_id}/draw").json()
-        result = Card(result["cards"][0]["value"], result["cards"][0]["suit"], result["cards"][0]["code"])
-        return result
+        return self._cards.pop()
+
+    def draw_cards(self, count: int) -> list[Card]:
+        """Draw count cards from the deck."""
+        return [self.draw() for _ in range(count)]
 
 
 class BlackjackController:
     """Blackjack controller. For controlling the game and data flow between view and database."""
 
+    _executor = ThreadPoolExecutor(max_workers=1)
+
     def __init__(self, deck: Deck, view: 'BlackjackView'):
         """Blackjack controller. For controlling the game and data flow between view and database."""
         if not deck.is_shuffled:
             deck.shuffle()
         self.player_hand = Hand()
         self.dealer_hand = Hand()
+        self._next_card: Future | None = None
         self.draw_first_cards(deck)
         self.state = {"dealer": self.dealer_hand, "player": self.player_hand}
         if self.player_hand.score == 21:
@@ -87,27 +206,47 @@ class BlackjackController:
             view.player_lost(self.state)
             return
         self.dealer_moves(deck)
-        if self.dealer_hand.score > 22:
+        if self.dealer_hand.score > 21 or self.dealer_hand.score < self.player_hand.score:
             view.player_won(self.state)
             return
         if self.dealer_hand.score > self.player_hand.score:
             view.player_lost(self.state)
+            return
+        view.push(self.state)
 
     def draw_first_cards(self, deck: Deck):
-        """Draw first four cards from deck."""
-        for _ in range(2):
-            self.player_hand.add_card(deck.draw())
-            self.dealer_hand.add_card(deck.draw())
+        """Draw first four cards from deck and deal them alternately."""
+        cards = deck.draw_cards(4)
+        for player_card, dealer_card in zip(cards[::2], cards[1::2]):
+            self.player_hand.add_card(player_card)
+            self.dealer_hand.add_card(dealer_card)
 
     def player_moves(self, deck: Deck, view: 'BlackjackView'):
-        """Move for player."""
-        while self.player_hand.score < 21 and view.ask_next_move(self.state) == "H":
-            self.player_hand.add_card(deck.draw())
+        """
+        Move for player.
+
+        If deck.prefetch is set, the next card is drawn in the background while
+        the player chooses the move. If the player stands, the card is kept for the dealer.
+        """
+        while self.player_hand.score < 21:
+            next_card = self._executor.submit(deck.draw) if deck.prefetch else None
+            if view.ask_next_move(self.state) != "H":
+                self._next_card = next_card
+                break
+            self.player_hand.add_card(deck.draw() if next_card is None else next_card.result())
 
     def dealer_moves(self, deck: Deck):
-        """Move for dealer."""
-        while self.dealer_hand.score < self.player_hand.score:
-            self.dealer_hand.add_card(deck.draw())
+        """Move for dealer. The dealer draws until the score is at least 17."""
+        while self.dealer_hand.score < 17:
+            self.dealer_hand.add_card(self.draw(deck))
+
+    def draw(self, deck: Deck) -> Card:
+        """Draw card from the deck, using the card drawn in advance if there is one."""
+        if self._next_card is None:
+            return deck.draw()
+        card = self._next_card.result()
+        self._next_card = None
+        return card
 
 
 class BlackjackView:
@@ -145,6 +284,15 @@ class BlackjackView:
         self.display_state(state, final=True)
         print("You won")
 
+    def push(self, state):
+        """
+        Display draw dialog to the user, the player and the dealer have equal scores.
+
+        :param state: dict with given structure: {"dealer": dealer_hand_object, "player": player_hand_object}
+        """
+        self.display_state(state, final=True)
+        print("Draw")
+
     def display_state(self, state, final=False):
         """
         Display state of the game for the user.
@@ -172,4 +320,5 @@ class BlackjackView:
 
 
 if __name__ == '__main__':
-    BlackjackController(Deck(), BlackjackView())  # start the game.
+    deck_class = Deck if "--online" in sys.argv[1:] else LocalDeck
+    BlackjackController(deck_class(shuffle=True), BlackjackView())  # start the game.
@@ -0,0 +1,96 @@
+"""Dealer outcome probabilities cached by the composition of removed cards."""
+from math import comb
+
+import numpy as np
+
+RANKS = 10  # rank index is card points - 2: 0..7 for 2-9, 8 for tens and faces, 9 for ace
+DECK_COUNTS = (4, 4, 4, 4, 4, 4, 4, 4, 16, 4)
+OUTCOMES = ("17", "18", "19", "20", "21", "bust")
+MAX_REMOVED = 8
+
+# T[i][n] is the number of multisets of size i over n ranks.
+T = [[comb(max(n + i - 1, 0), i) for n in range(RANKS + 1)] for i in range(MAX_REMOVED + 1)]
+_OFFSETS = [sum(T[i][RANKS] for i in range(j)) for j in range(MAX_REMOVED + 2)]
+CACHE_LEN = _OFFSETS[MAX_REMOVED + 1]
+
+# Cached probabilities and filled flags per upcard and composition, allocated on first use.
+_probs = None
+_filled = None
+
+
+def address(removed_sorted) -> int:
+    """
+    Perfect hash of a multiset of removed cards.
+
+    Multisets of the same size are numbered consecutively, smaller sizes first.
+    :param removed_sorted: rank indices of removed cards sorted in descending order
+    :return: index in range(CACHE_LEN)
+    """
+    j = len(removed_sorted)
+    return _OFFSETS[j] + sum(T[i][removed_sorted[-i]] for i in range(1, j + 1))
+
+
+def removed_counts(cards) -> list:
+    """
+    Count cards per rank index.
+
+    Pass the cards the player has seen, their own hand and the dealer's upcard,
+    to get the removed composition for dealer_probs.
+    :param cards: iterable of blackjack Card objects
+    """
+    counts = [0] * RANKS
+    for card in cards:
+        counts[card.rank_index] += 1
+    return counts
+
+
+def dealer_probs(upcard: int, removed) -> np.ndarray:
+    """
+    Get the probabilities of the dealer's final outcomes.
+
+    The dealer draws from a single deck until the score is at least 17.
+    Results for up to MAX_REMOVED removed cards are cached and returned as read-only arrays.
+    :param upcard: rank index of the dealer's face up card
+    :param removed: counts of cards removed from the deck per rank index, including the upcard
+    :return: float32 array of probabilities in the order of OUTCOMES
+    """
+    if (len(removed) != RANKS or removed[upcard] < 1
+            or any(not 0 <= n <= count for count, n in zip(DECK_COUNTS, removed))):
+        raise ValueError("Invalid composition of removed cards!")
+    removed_sorted = [rank for rank in range(RANKS - 1, -1, -1) for _ in range(removed[rank])]
+    if len(removed_sorted) > MAX_REMOVED:
+        return _dealer_outcomes(upcard, removed)
+    global _probs, _filled
+    if _probs is None:
+        _probs = np.zeros((RANKS * CACHE_LEN, len(OUTCOMES)), dtype=np.float32)
+        _filled = np.zeros(RANKS * CACHE_LEN, dtype=bool)
+    key = upcard * CACHE_LEN + address(removed_sorted)
+    if not _filled[key]:
+        _probs[key] = _dealer_outcomes(upcard, removed)
+        _filled[key] = True
+    probs = _probs[key]
+    probs.flags.writeable = False
+    return probs
+
+
+def _dealer_outcomes(upcard: int, removed) -> np.ndarray:
+    """Enumerate every dealer draw sequence from the remaining deck."""
+    remaining = [count - n for count, n in zip(DECK_COUNTS, removed)]
+    probs = np.zeros(len(OUTCOMES))
+    _dealer_draw(upcard + 2, int(upcard == 9), remaining, sum(remaining), 1.0, probs)
+    return probs.astype(np.float32)
+
+
+def _dealer_draw(score: int, aces: int, remaining: list, left: int, weight: float, probs: np.ndarray):
+    """Add weight of the current dealer hand to probs, drawing further cards while the score is under 17."""
+    while score > 21 and aces > 0:
+        score -= 10
+        aces -= 1
+    if score >= 17:
+        probs[min(score, 22) - 17] += weight
+        return
+    for rank, count in enumerate(remaining):
+        if count:
+            remaining[rank] -= 1
+            _dealer_draw(score + rank + 2, aces + (rank == 9), remaining, left - 1, weight * count / left, probs)
+            remaining[rank] += 1
@@ -0,0 +1,77 @@
+"""Monte Carlo simulation of blackjack hands, jitted over an int8 array of card points."""
+import numpy as np
+from numba import njit
+
+# Points of the 52 cards: four of each value from 2 to 10, jack, queen, king and ace.
+POINTS = np.array([2, 3, 4, 5, 6, 7, 8, 9, 10, 10, 10, 10, 11], dtype=np.int8).repeat(4)
+
+
+@njit(cache=True)
+def add_card(total: int, aces: int, points: int) -> tuple:
+    """Add card points to a hand given as (total, aces), return the new hand."""
+    total += points
+    if points == 11:
+        aces += 1
+    while total > 21 and aces > 0:
+        total -= 10
+        aces -= 1
+    return total, aces
+
+
+@njit(cache=True)
+def play_hand(order: np.ndarray, stand_on: int) -> int:
+    """
+    Play one hand with the rules of BlackjackController.
+
+    :param order: shuffled order of POINTS
+    :param stand_on: the player hits while the score is below this
+    :return: 1 if the player won, -1 if lost and 0 for a draw
+    """
+    player = dealer = aces = dealer_aces = 0
+    for i in range(2):
+        player, aces = add_card(player, aces, POINTS[order[2 * i]])
+        dealer, dealer_aces = add_card(dealer, dealer_aces, POINTS[order[2 * i + 1]])
+    pos = 4
+    if player == 21:
+        return 1
+    while player < 21 and player < stand_on:
+        player, aces = add_card(player, aces, POINTS[order[pos]])
+        pos += 1
+    if player == 21:
+        return 1
+    if player > 21 or dealer == 21:
+        return -1
+    while dealer < 17:
+        dealer, dealer_aces = add_card(dealer, dealer_aces, POINTS[order[pos]])
+        pos += 1
+    if dealer > 21 or dealer < player:
+        return 1
+    if dealer > player:
+        return -1
+    return 0
+
+
+@njit(cache=True)
+def play_hands(n: int, stand_on: int, seed: int) -> np.ndarray:
+    """Play n hands, each from a freshly shuffled deck, and return their results."""
+    np.random.seed(seed)
+    results = np.empty(n, dtype=np.int8)
+    for i in range(n):
+        results[i] = play_hand(np.random.permutation(len(POINTS)), stand_on)
+    return results
+
+
+def simulate(n: int = 100_000, stand_on: int = 17, seed: int = 0) -> dict:
+    """
+    Simulate n hands where the player stands at stand_on.
+
+    :return: dict with the share of won, drawn and lost hands
+    """
+    results = play_hands(n, stand_on, seed)
+    return {"won": np.mean(results == 1), "draw": np.mean(results == 0), "lost": np.mean(results == -1)}
+
+
+if __name__ == '__main__':
+    for stand_on in range(12, 22):
+        rates = simulate(stand_on=stand_on)
+        print(f"Stand on {stand_on:>2}: " + ", ".join(f"{key} {value:.3f}" for key, value in rates.items()))
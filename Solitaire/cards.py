@@ -19,6 +19,8 @@ class Card:
     SUITS = ("c", "s", "d", "h")
     SYMBOLS = ('â™£', 'â™ ', 'â™¦', 'â™¥')
 
+    __slots__ = ('_rank', '_suit', 'face_up', 'symbols', 'decorated')
+
     def __init__(self, rank, suit, face_up=True, symbols=False, decorated=True):
         """
         Constructor.
@@ -0,0 +1,93 @@
+"""Random playouts of Golf Solitaire on numpy arrays."""
+import numpy as np
+from numba import njit
+
+from solitaire import Solitaire
+
+COLUMNS = Solitaire.columns
+CARDS_IN_COLUMN = Solitaire.cards_in_column
+# Ranks of the 52 cards, four of each rank from 1 (ace) to 13 (king).
+RANKS = np.arange(1, 14, dtype=np.int8).repeat(4)
+
+
+def game_arrays(game: Solitaire) -> tuple:
+    """
+    Convert a game to the array representation used by the jitted functions.
+
+    :return: tuple of tableau (ranks, one row per column), column lengths, stock ranks and waste top rank
+    """
+    height = max(1, max(len(column) for column in game.tableau))
+    tableau = np.zeros((len(game.tableau), height), dtype=np.int8)
+    lens = np.zeros(len(game.tableau), dtype=np.int8)
+    for col, column in enumerate(game.tableau):
+        tableau[col, :len(column)] = [card.rank for card in column]
+        lens[col] = len(column)
+    stock = np.array([card.rank for card in game.stock], dtype=np.int8)
+    return tableau, lens, stock, np.int8(game.waste[-1].rank)
+
+
+@njit(cache=True)
+def can_move_jit(tableau: np.ndarray, lens: np.ndarray, waste_rank: int, col: int) -> bool:
+    """Validate if the topmost card of a column can be moved to the waste pile, see Solitaire.can_move."""
+    return lens[col] > 0 and abs(waste_rank - tableau[col, lens[col] - 1]) == 1
+
+
+@njit(cache=True)
+def move_card_jit(tableau: np.ndarray, lens: np.ndarray, col: int) -> int:
+    """Remove the topmost card of a column and return its rank as the new waste top. Does not validate the move."""
+    lens[col] -= 1
+    return tableau[col, lens[col]]
+
+
+@njit(cache=True)
+def has_lost_jit(tableau: np.ndarray, lens: np.ndarray, stock_len: int, waste_rank: int) -> bool:
+    """Check for the losing position: no cards left in stock and no possible moves."""
+    if stock_len > 0:
+        return False
+    for col in range(len(lens)):
+        if can_move_jit(tableau, lens, waste_rank, col):
+            return False
+    return True
+
+
+@njit(cache=True)
+def playout(tableau: np.ndarray, lens: np.ndarray, stock: np.ndarray, waste_rank: int) -> bool:
+    """
+    Play the position to the end with random moves, modifying tableau and lens.
+
+    A random possible move is made if there is one, otherwise a card is dealt from the stock.
+    :return: True if the game was won
+    """
+    stock_len = len(stock)
+    movable = np.empty(len(lens), dtype=np.int64)
+    while lens.sum() > 0:
+        if has_lost_jit(tableau, lens, stock_len, waste_rank):
+            return False
+        count = 0
+        for col in range(len(lens)):
+            if can_move_jit(tableau, lens, waste_rank, col):
+                movable[count] = col
+                count += 1
+        if count:
+            waste_rank = move_card_jit(tableau, lens, movable[np.random.randint(count)])
+        else:
+            stock_len -= 1
+            waste_rank = stock[stock_len]
+    return True
+
+
+@njit(cache=True)
+def play_random(seed: int) -> bool:
+    """Deal a new game with the given seed and play it out randomly, return True if it was won."""
+    np.random.seed(seed)
+    ranks = RANKS[np.random.permutation(len(RANKS))]
+    dealt = COLUMNS * CARDS_IN_COLUMN
+    tableau = ranks[:dealt].copy().reshape((COLUMNS, CARDS_IN_COLUMN))
+    lens = np.full(COLUMNS, CARDS_IN_COLUMN, dtype=np.int8)
+    return playout(tableau, lens, ranks[dealt + 1:].copy(), ranks[dealt])
+
+
+if __name__ == '__main__':
+    games = 100_000
+    won = sum(play_random(seed) for seed in range(games))
+    print(f"Won {won} of {games} random games ({won / games:.2%})")
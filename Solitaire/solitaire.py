@@ -1,9 +1,13 @@
 """Golf solitaire."""
 from itertools import zip_longest
+import sys
 from textwrap import dedent
 
 from cards import Deck
 
+# _ADJ[rank] has the bits of the ranks adjacent to rank set, ace (1) and king (13) have one neighbour.
+_ADJ = [0] + [((1 << (r - 1)) if r > 1 else 0) | ((1 << (r + 1)) if r < 13 else 0) for r in range(1, 14)]
+
 
 class Solitaire:
     """
@@ -35,23 +39,24 @@ class Solitaire:
             for element in range(Solitaire.cards_in_column):
                 column.append(self.deck.deal_card())
             self.tableau.append(column)
+        self._header = (f" {'    '.join(str(i) for i in range(Solitaire.columns))}\n"
+                        f"{'-' * (5 * Solitaire.columns - 1)}\n")
         self.waste = [self.deck.deal_card()]
         for number in range(51 - (Solitaire.columns * Solitaire.cards_in_column)):
             self.stock.append(self.deck.deal_card())
 
-    def can_move(self, card) -> bool:
+    def can_move(self, col: int) -> bool:
         """
-        Validate if a card from the tableau can be moved to the waste pile.
+        Validate if the topmost card of a column can be moved to the waste pile.
 
-        The card must be last in the column list and adjacent by rank
+        The column must not be empty and its last card must be adjacent by rank
         to the topmost card of the waste pile (last in waste list).
         Example: 8 is adjacent to 7 and 9. Ace is only adjacent to 2.
         King is only adjacent to Queen.
+        :param col: index of column
         """
-        for column in self.tableau:
-            if len(column) > 0 and column[-1] == card and abs(self.waste[-1].rank - card.rank) == 1:
-                return True
-        return False
+        column = self.tableau[col]
+        return bool(column) and (_ADJ[self.waste[-1].rank] >> column[-1].rank) & 1 == 1
 
     def move_card(self, col: int):
         """
@@ -60,8 +65,7 @@ class Solitaire:
         Does not validate the move.
         :param col: index of column
         """
-        self.waste.append(self.tableau[col][-1])
-        del self.tableau[col][-1]
+        self.waste.append(self.tableau[col].pop())
 
     def deal_from_stock(self):
         """
@@ -70,15 +74,11 @@ class Solitaire:
         If the stock is empty, do nothing.
         """
         if self.stock:
-            self.waste.append(self.stock[-1])
-            del self.stock[-1]
+            self.waste.append(self.stock.pop())
 
     def has_won(self) -> bool:
         """Check for the winning position - no cards left in tableau."""
-        for element in self.tableau:
-            if len(element) > 0:
-                return False
-        return True
+        return not any(self.tableau)
 
     def has_lost(self) -> bool:
         """
@@ -87,9 +87,9 @@ class Solitaire:
         Losing position: no cards left in stock and no possible moves.
         """
         if not self.stock:
-            for element in self.tableau:
-                if len(element) > 0 and self.can_move(element[-1]):
-                        return False
+            for col in range(len(self.tableau)):
+                if self.can_move(col):
+                    return False
             return True
 
     def print_game(self):
@@ -104,12 +104,10 @@ class Solitaire:
 
         You may modify/write your own print_game.
         """
-        print(f" {'    '.join(list('0123456'))}")
-        print('-' * 34)
-        print("\n".join([(" ".join((map(str, x)))) for x in (zip_longest(*self.tableau, fillvalue="    "))]))
-        print()
-        print(f"Stock pile: {len(self.stock)} card{'s' if len(self.stock) != 1 else ''}")
-        print(f"Waste pile: {self.waste[-1] if self.waste else 'Empty'}")
+        body = "\n".join([" ".join(map(str, row)) for row in zip_longest(*self.tableau, fillvalue="    ")])
+        footer = (f"Stock pile: {len(self.stock)} card{'s' if len(self.stock) != 1 else ''}\n"
+                  f"Waste pile: {self.waste[-1] if self.waste else 'Empty'}\n")
+        sys.stdout.write(f"{self._header}{body}\n\n{footer}")
 
     @staticmethod
     def rules():
@@ -145,21 +143,25 @@ class Solitaire:
         """
         print("Let's play Golf Solitaire! Commands: (d) - deal a card from the stock, (r)  show rules, (q) - quit."
               "Enter the column number.")
+        handlers = {"r": self.rules, "d": self.deal_from_stock}
         play = True
         while play:
             self.print_game()
             command = input()
             if command == "q":
                 return "You quit!"
-            elif command == "r":
-                self.rules()
-            elif command == "d":
-                self.deal_from_stock()
-            elif 0 <= int(command) < Solitaire.columns:
-                if len(self.tableau[int(command)]) > 0 and self.can_move(self.tableau[int(command)][-1]):
-                        self.move_card(int(command))
+            if command in handlers:
+                handlers[command]()
             else:
-                print("Not a valid command! Try again.")
+                try:
+                    col = int(command)
+                except ValueError:
+                    col = -1
+                if 0 <= col < Solitaire.columns:
+                    if self.can_move(col):
+                        self.move_card(col)
+                else:
+                    print("Not a valid command! Try again.")
             if self.has_won():
                 return "You have won!"
             elif self.has_lost():